@@ -1,119 +1,413 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import (
+    Flask,
+    Response,
+    g,
+    request,
+    send_from_directory,
+    stream_with_context,
+)
+from flask_compress import Compress
 from flask_cors import CORS
+from dotenv import load_dotenv
+from product import ProductRow
+from dataclasses import fields
+import atexit
+import hashlib
+import orjson
 import sqlite3
 import os
+import re
+import shutil
+import subprocess
+import threading
+import time
 
-app = Flask(__name__)
-app.debug = os.environ.get("IS_DEBUG_MODE", True)
-CORS(app)
+# .env fills in whatever the real environment does not set
+load_dotenv()
+
+def env_flag(name, default):
+    """Boolean environment variable ("True"/"False", "1"/"0")"""
+    return os.environ.get(name, str(default)).strip().lower() in ("1", "true", "yes")
 
+# Configuration, read once at import
 # Render.com automatically provides PORT environment variable
 PORT = int(os.environ.get("PORT", 10000))
 DB_PATH = os.environ.get("DB_PATH", "amazon_products.db")
+IS_DEBUG_MODE = env_flag("IS_DEBUG_MODE", False)
+USE_NGROK = env_flag("USE_NGROK", False)
+NGROK_AUTH_TOKEN = os.environ.get("NGROK_AUTH_TOKEN")
+SERVE_STATIC = env_flag("SERVE_STATIC", True)
+# Browser cache lifetime for dashboard files (revalidated by ETag afterwards)
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 86400))
+CACHE_TTL = float(os.environ.get("CACHE_TTL", 30))
+
+app = Flask(__name__)
+app.debug = IS_DEBUG_MODE
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
+CORS(app)
+
+class CompressedBodyCache:
+    """Compressed bodies of cached responses, keyed by "<algorithm>;<etag>" """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        # Responses without an ETag (key "<algorithm>;") are not cached
+        if key.endswith(";"):
+            return
+        if len(self.data) >= self.MAX_ENTRIES:
+            self.data.clear()
+        self.data[key] = value
+
+# Brotli with gzip fallback for JSON/HTML/JS/CSS above 1 KB
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_ALGORITHM_STREAMING"] = ["br", "deflate"]
+app.config["COMPRESS_MIN_SIZE"] = 1024
+app.config["COMPRESS_LEVEL"] = 4
+# Cached responses are compressed once per algorithm
+app.config["COMPRESS_CACHE_BACKEND"] = CompressedBodyCache
+app.config["COMPRESS_CACHE_KEY"] = lambda request: g.get("etag", "")
+Compress(app)
+
+ASIN_RE = re.compile(r"[A-Z0-9]{10}")
+
+# Pagination for /api/products
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Products serialized per streamed chunk
+STREAM_BATCH_SIZE = 512
+
+# In-process response cache: normalized request -> (stored_at, body, etag),
+# oldest first
+CACHE_MAX_ENTRIES = 256
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+# index.html as (mtime, body, etag)
+_index_cache = None
+
+# Queries are module constants so every request reuses the same prepared
+# statement from the connection's statement cache
+# Built from the ProductRow fields, so rows map onto it positionally.
+# is_prime is aliased so PARSE_COLNAMES applies the boolean converter.
+PRODUCT_COLUMNS = ", ".join(
+    'is_prime AS "is_prime [boolean]"' if field.name == "is_prime" else field.name
+    for field in fields(ProductRow)
+)
+# Keyset pagination: seek past the (rank, id) of the previous page's last row.
+# Unranked products sort last instead of dropping out of the comparison, and
+# idx_products_rank_key matches the key expression exactly.
+# SQLite only seeks an expression index for a plain range on the expression,
+# hence the spelled-out row comparison.
+NULL_RANK = 2147483647
+RANK_KEY = f"COALESCE(rank, {NULL_RANK})"
+SQL_FIRST_PRODUCTS = f"""
+SELECT {PRODUCT_COLUMNS}
+FROM products
+ORDER BY {RANK_KEY} ASC, id ASC
+LIMIT ?
+"""
+SQL_PRODUCTS = f"""
+SELECT {PRODUCT_COLUMNS}
+FROM products
+WHERE {RANK_KEY} >= :rank AND ({RANK_KEY} > :rank OR id > :id)
+ORDER BY {RANK_KEY} ASC, id ASC
+LIMIT :limit
+"""
+SQL_PRODUCT_BY_ASIN = f"""
+SELECT {PRODUCT_COLUMNS}
+FROM products
+WHERE asin = ?
+LIMIT 1
+"""
+SQL_STATS = """
+SELECT
+    total,
+    price_sum / NULLIF(price_count, 0) AS avg_price,
+    rating_sum / NULLIF(rating_count, 0) AS avg_rating,
+    prime_count
+FROM products_stats
+WHERE id = 1
+"""
+
+# Bumped whenever SQL_MIGRATE changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 3
+
+# products_stats holds the /api/stats running sums in a single row that
+# triggers adjust by each written row's delta, so neither reads nor writes
+# scan products. This relies on writers upserting (ON CONFLICT DO UPDATE):
+# INSERT OR REPLACE deletes conflicting rows without firing DELETE triggers.
+def stats_delta(op, row):
+    """SET clause adding (op "+") or removing (op "-") a row from the stats"""
+    return f"""
+        total = total {op} 1,
+        price_sum = price_sum {op} CASE WHEN {row}.price > 0 THEN {row}.price ELSE 0 END,
+        price_count = price_count {op} CASE WHEN {row}.price > 0 THEN 1 ELSE 0 END,
+        rating_sum = rating_sum {op} COALESCE({row}.rating, 0),
+        rating_count = rating_count {op} CASE WHEN {row}.rating IS NULL THEN 0 ELSE 1 END,
+        prime_count = prime_count {op} CASE WHEN {row}.is_prime = 1 THEN 1 ELSE 0 END
+    """
+
+# Run once per database, in one transaction, when user_version is older.
+# Earlier versions had no version number and recomputed the whole row on
+# every write; their table and triggers are replaced.
+SQL_MIGRATE = (
+    # Lets the pagination queries walk the index instead of sorting the table
+    "DROP INDEX IF EXISTS idx_products_rank",
+    f"CREATE INDEX IF NOT EXISTS idx_products_rank_key ON products({RANK_KEY}, id)",
+    "DROP TRIGGER IF EXISTS products_stats_insert",
+    "DROP TRIGGER IF EXISTS products_stats_update",
+    "DROP TRIGGER IF EXISTS products_stats_delete",
+    "DROP TABLE IF EXISTS products_stats",
+    """
+    CREATE TABLE products_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL,
+        price_sum REAL NOT NULL,
+        price_count INTEGER NOT NULL,
+        rating_sum REAL NOT NULL,
+        rating_count INTEGER NOT NULL,
+        prime_count INTEGER NOT NULL
+    )
+    """,
+    # Back-fill from the current products
+    """
+    INSERT INTO products_stats
+    SELECT
+        1,
+        COUNT(*),
+        TOTAL(CASE WHEN price > 0 THEN price END),
+        COUNT(CASE WHEN price > 0 THEN 1 END),
+        TOTAL(rating),
+        COUNT(rating),
+        COUNT(CASE WHEN is_prime = 1 THEN 1 END)
+    FROM products
+    """,
+    f"""
+    CREATE TRIGGER products_stats_insert AFTER INSERT ON products
+    BEGIN
+        UPDATE products_stats SET {stats_delta("+", "NEW")} WHERE id = 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER products_stats_update AFTER UPDATE ON products
+    BEGIN
+        UPDATE products_stats SET {stats_delta("-", "OLD")} WHERE id = 1;
+        UPDATE products_stats SET {stats_delta("+", "NEW")} WHERE id = 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER products_stats_delete AFTER DELETE ON products
+    BEGIN
+        UPDATE products_stats SET {stats_delta("-", "OLD")} WHERE id = 1;
+    END
+    """,
+    f"PRAGMA user_version = {SCHEMA_VERSION}",
+)
+
+# Columns typed as "[boolean]" in a query come back as Python bools.
+# bytes.__ne__ is called directly from C, with no Python frame per row.
+# (PARSE_DECLTYPES would pick up the declared BOOLEAN type without the
+# alias, but it also turns TIMESTAMP columns into datetimes, which
+# changes the scraped_at format in the API.)
+sqlite3.register_converter("boolean", b"0".__ne__)
+
+# One long-lived connection per worker thread
+_local = threading.local()
+# Set once ensure_schema has succeeded in this process
+_schema_ready = False
+_schema_lock = threading.Lock()
 
 def get_db_connection():
-    """Database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Database connection, opened once per thread and reused"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(
+            DB_PATH,
+            detect_types=sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA busy_timeout=5000;
+            PRAGMA cache_spill=OFF;
+        """
+        )
+        _local.conn = conn
+    if not _schema_ready:
+        ensure_schema(conn)
     return conn
 
-# API endpoints
-@app.route("/")
-def index():
-    """Home page"""
-    return send_from_directory(".", "index.html")
+def ensure_schema(conn):
+    """Run init_database once per process, retrying until it succeeds"""
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        try:
+            init_database(conn)
+        except sqlite3.OperationalError:
+            # The products table is created by the scraper on its first run;
+            # until then every request tries again
+            return
+        _schema_ready = True
 
+def init_database(conn):
+    """Bring the index and the stats table and triggers up to SCHEMA_VERSION"""
+    # IMMEDIATE takes the write lock first, so concurrent workers migrate
+    # one at a time and the later ones see the new user_version
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            for statement in SQL_MIGRATE:
+                conn.execute(statement)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+def ojson(obj, status=200):
+    """JSON response serialized with orjson"""
+    return app.response_class(
+        orjson.dumps(obj), status=status, mimetype="application/json"
+    )
+
+def get_cached(key):
+    """Cached (body, etag) for key if still fresh, else None"""
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL:
+        return entry[1], entry[2]
+    return None
+
+def store_cached(key, body):
+    """Store a response body and return its ETag"""
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        # Re-inserting keeps the dict ordered by store time
+        _CACHE.pop(key, None)
+        # Expired entries sit at the front; drop them, then the oldest
+        # fresh ones while over the size limit
+        for old_key, entry in list(_CACHE.items()):
+            if now - entry[0] < CACHE_TTL and len(_CACHE) < CACHE_MAX_ENTRIES:
+                break
+            del _CACHE[old_key]
+        _CACHE[key] = (now, body, etag)
+    return etag
+
+def cached_response(body, etag):
+    """JSON response with ETag, answering 304 when the client already has it"""
+    g.etag = etag
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+# API endpoints
 @app.route("/api/products", methods=["GET"])
 def get_products():
-    """Get all products"""
+    """Get products page by page (?limit=&after_rank=&after_id=), streamed in batches"""
+    limit = min(max(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    after_rank = request.args.get("after_rank", NULL_RANK, type=int)
+    after_id = request.args.get("after_id", type=int)
+
+    # Keyed by the parsed parameters, so unrelated query strings share an entry;
+    # after_rank means nothing without after_id
+    after = None if after_id is None else (after_rank, after_id)
+    cache_key = ("products", limit, after)
+    cached = get_cached(cache_key)
+    if cached:
+        return cached_response(*cached)
+
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT 
-                id, asin, title, rank, price, currency,
-                list_price, discount_percent, rating, reviews_count,
-                is_prime, best_sellers_rank, bullet_points, 
-                main_image_url, scraped_at
-            FROM products
-            ORDER BY rank ASC
-        """
-        )
-        rows = cursor.fetchall()
-        conn.close()
-
-        products = []
-        for row in rows:
-            products.append(
-                {
-                    "id": row["id"],
-                    "asin": row["asin"],
-                    "title": row["title"],
-                    "rank": row["rank"],
-                    "price": row["price"],
-                    "currency": row["currency"],
-                    "list_price": row["list_price"],
-                    "discount_percent": row["discount_percent"],
-                    "rating": row["rating"],
-                    "reviews_count": row["reviews_count"],
-                    "is_prime": bool(row["is_prime"]),
-                    "best_sellers_rank": row["best_sellers_rank"],
-                    "bullet_points": row["bullet_points"],
-                    "main_image_url": row["main_image_url"],
-                    "scraped_at": row["scraped_at"],
-                }
+        if after_id is None:
+            cursor = conn.execute(SQL_FIRST_PRODUCTS, (limit,))
+        else:
+            cursor = conn.execute(
+                SQL_PRODUCTS, {"rank": after_rank, "id": after_id, "limit": limit}
             )
-
-        return jsonify({"success": True, "count": len(products), "products": products})
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return ojson({"success": False, "error": str(e)}, 500)
+
+    def generate():
+        """Yield the JSON body straight from the cursor, one batch of products at a time"""
+        count = 0
+        last = None
+        yield b'{"success":true,"products":['
+        while rows := cursor.fetchmany(STREAM_BATCH_SIZE):
+            # Serialize the batch as one array and drop its brackets
+            chunk = orjson.dumps([ProductRow.from_row(row) for row in rows])[1:-1]
+            yield (b"," if count else b"") + chunk
+            count += len(rows)
+            last = rows[-1]
+
+        # A full page may have more after it; the client passes this back
+        next_after = None
+        if count == limit:
+            rank = NULL_RANK if last["rank"] is None else last["rank"]
+            next_after = {"rank": rank, "id": last["id"]}
+        yield b'],"count":%d,"next_after":%s}' % (count, orjson.dumps(next_after))
+
+    def generate_and_cache():
+        """Stream the body and keep a copy for the next requests"""
+        chunks = []
+        for chunk in generate():
+            chunks.append(chunk)
+            yield chunk
+        store_cached(cache_key, b"".join(chunks))
+
+    return Response(
+        stream_with_context(generate_and_cache()), mimetype="application/json"
+    )
 
 @app.route("/api/products/<asin>", methods=["GET"])
 def get_product(asin):
     """Get single product by ASIN"""
+    if not ASIN_RE.fullmatch(asin):
+        return ojson({"success": False, "error": "Invalid ASIN"}, 400)
+
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM products WHERE asin = ?", (asin,))
-        row = cursor.fetchone()
-        conn.close()
+        row = conn.execute(SQL_PRODUCT_BY_ASIN, (asin,)).fetchone()
 
         if row:
-            product = dict(row)
-            product["is_prime"] = bool(product["is_prime"])
-            return jsonify({"success": True, "product": product})
+            return ojson({"success": True, "product": ProductRow.from_row(row)})
         else:
-            return jsonify({"success": False, "error": "Product not found"}), 404
+            return ojson({"success": False, "error": "Product not found"}, 404)
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return ojson({"success": False, "error": str(e)}, 500)
 
 @app.route("/api/stats", methods=["GET"])
 def get_stats():
     """Database statistics"""
+    cache_key = "stats"
+    cached = get_cached(cache_key)
+    if cached:
+        return cached_response(*cached)
+
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) as total FROM products")
-        total = cursor.fetchone()["total"]
-
-        cursor.execute("SELECT AVG(price) as avg_price FROM products WHERE price > 0")
-        avg_price = cursor.fetchone()["avg_price"]
-
-        cursor.execute(
-            "SELECT AVG(rating) as avg_rating FROM products WHERE rating IS NOT NULL"
-        )
-        avg_rating = cursor.fetchone()["avg_rating"]
-
-        cursor.execute(
-            "SELECT COUNT(*) as prime_count FROM products WHERE is_prime = 1"
-        )
-        prime_count = cursor.fetchone()["prime_count"]
-
-        conn.close()
+        row = conn.execute(SQL_STATS).fetchone()
+        total = row["total"]
+        avg_price = row["avg_price"]
+        avg_rating = row["avg_rating"]
+        prime_count = row["prime_count"]
 
-        return jsonify(
+        body = orjson.dumps(
             {
                 "success": True,
                 "stats": {
@@ -124,26 +418,130 @@ def get_stats():
                 },
             }
         )
+        return cached_response(body, store_cached(cache_key, body))
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return ojson({"success": False, "error": str(e)}, 500)
 
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint for Render"""
-    return jsonify({"status": "healthy", "service": "Amazon Products API"}), 200
+    return ojson({"status": "healthy", "service": "Amazon Products API"}, 200)
+
+# Dashboard files, for running without a front-end proxy (dev, Render).
+# Behind nginx (see nginx.conf) set SERVE_STATIC=False: nginx serves them
+# straight from disk and only the API reaches Python.
+def index():
+    """Home page, kept in memory until index.html changes on disk"""
+    global _index_cache
+    path = os.path.join(app.root_path, "index.html")
+    mtime = os.stat(path).st_mtime
+    if _index_cache is None or _index_cache[0] != mtime:
+        with open(path, "rb") as f:
+            body = f.read()
+        _index_cache = (mtime, body, hashlib.blake2b(body, digest_size=16).hexdigest())
+    _, body, etag = _index_cache
+
+    g.etag = etag
+    response = app.response_class(body, mimetype="text/html")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
 
-@app.route("/<path:path>")
 def static_files(path):
     """Serve static files"""
     return send_from_directory(".", path)
 
+if SERVE_STATIC:
+    app.add_url_rule("/", view_func=index)
+    app.add_url_rule("/<path:path>", view_func=static_files)
+
+# Looked up once; None when ngrok is not installed
+NGROK_PATH = shutil.which("ngrok")
+# The agent started by start_ngrok, stopped again when the server exits
+_ngrok_process = None
+
+def start_ngrok():
+    """Open a public ngrok tunnel to PORT and return its https URL (None on failure)"""
+    if NGROK_PATH is None:
+        print("Ngrok not found - install it or run 'ngrok http <port>' manually")
+        return None
+
+    global _ngrok_process
+    # The token goes through the environment, where ps does not show it
+    env = dict(os.environ)
+    if NGROK_AUTH_TOKEN:
+        env["NGROK_AUTHTOKEN"] = NGROK_AUTH_TOKEN
+    _ngrok_process = subprocess.Popen(
+        [NGROK_PATH, "http", str(PORT), "--log", "stdout", "--log-format", "json"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    atexit.register(stop_ngrok)
+
+    # Other ngrok agents the user runs are left alone. One of them may hold
+    # the local API port (4040), so the URL comes from this agent's own log.
+    public_urls = []
+    started = threading.Event()
+
+    def read_log():
+        # Reads until the agent exits, so it never blocks on a full pipe
+        for line in _ngrok_process.stdout:
+            if started.is_set():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            url = entry.get("url", "")
+            if entry.get("msg") == "started tunnel" and url.startswith("https://"):
+                public_urls.append(url)
+                started.set()
+
+    threading.Thread(target=read_log, daemon=True).start()
+    if started.wait(timeout=10):
+        return public_urls[0]
+
+    print("Ngrok tunnel did not come up - run 'ngrok http <port>' manually")
+    stop_ngrok()
+    return None
+
+def stop_ngrok():
+    """Stop the ngrok agent started by start_ngrok, if it is still running"""
+    if _ngrok_process is None or _ngrok_process.poll() is not None:
+        return
+    _ngrok_process.terminate()
+    try:
+        _ngrok_process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        _ngrok_process.kill()
+
 if __name__ == "__main__":
     print("=" * 60)
-    print("Amazon Products API Server (Render.com)")
+    print("Amazon Products API Server (development)")
     print("=" * 60)
     print(f"Port: {PORT}")
     print(f"Database: {DB_PATH}")
+    print("For production run: gunicorn api_server:app")
     print("=" * 60)
-    
-    # Run Flask app - Render expects 0.0.0.0 binding
-    app.run(host="0.0.0.0", port=PORT, debug=False)
\ No newline at end of file
+
+    if USE_NGROK:
+        print("Starting ngrok tunnel...")
+        public_url = start_ngrok()
+        if public_url:
+            with open("public_url.txt", "w") as f:
+                f.write(f"Public URL: {public_url}\n")
+                f.write(f"Dashboard: {public_url}\n")
+                f.write(f"API Products: {public_url}/api/products\n")
+                f.write(f"API Stats: {public_url}/api/stats\n")
+            print(f"Public URL: {public_url}")
+            print(f"Dashboard: {public_url}")
+            print(f"Stats: {public_url}/api/stats")
+            print(f"Products: {public_url}/api/products")
+            print("=" * 60)
+
+    # Werkzeug dev server; production runs under Gunicorn (gunicorn.conf.py)
+    app.run(host="0.0.0.0", port=PORT, debug=False, threaded=True)
\ No newline at end of file
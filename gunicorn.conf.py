@@ -0,0 +1,35 @@
+"""
+Gunicorn settings for the API server
+Loaded automatically by: gunicorn api_server:app
+"""
+
+import os
+
+# Render.com automatically provides PORT environment variable
+bind = f"0.0.0.0:{os.environ.get('PORT', 10000)}"
+
+
+def usable_cpus():
+    """CPUs this process may run on (like nproc), not all of the host's"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # No affinity API (macOS, Windows)
+        return os.cpu_count() or 1
+
+
+# One worker process per core so requests run in parallel instead of
+# queueing behind a single GIL
+workers = int(os.environ.get("GUNICORN_WORKERS", usable_cpus()))
+
+# Threaded workers: a request waiting on SQLite or a slow client
+# does not hold up the other requests of the same worker
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+keepalive = 15
+backlog = 2048
+
+# Worker heartbeat files in RAM rather than on a possibly slow disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
@@ -0,0 +1,31 @@
+"""
+Product row model for the API
+api_server.PRODUCT_COLUMNS is built from its fields, so rows map onto it positionally
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ProductRow:
+    id: int
+    asin: str
+    title: str
+    rank: Optional[int]
+    price: Optional[float]
+    currency: Optional[str]
+    list_price: Optional[float]
+    discount_percent: Optional[float]
+    rating: Optional[float]
+    reviews_count: Optional[int]
+    is_prime: Optional[bool]
+    best_sellers_rank: Optional[str]
+    bullet_points: Optional[str]
+    main_image_url: Optional[str]
+    scraped_at: Optional[str]
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from a database row with the columns in field order"""
+        return cls(*row)
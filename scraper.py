@@ -9,14 +9,28 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from bs4 import BeautifulSoup
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import requests
+import json
+import os
 import sqlite3
 import time
 import re
 import logging
+import multiprocessing
 from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, fields
 import random
 import sys
+import threading
+
+try:
+    # Optional: RE2's automaton beats backtracking on the per-page patterns
+    import re2 as _re
+except ImportError:
+    _re = re
 
 # ===== Logging Configuration =====
 logging.basicConfig(
@@ -25,8 +39,87 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ===== Regex Patterns =====
+_PRICE_PREFIX_RE = re.compile(
+    r"^(Price|From|Save|Limited time deal|List Price|List:)[\s:]*", re.IGNORECASE
+)
+_CURRENCY_RE = re.compile(r"([\$£€¥])")
+# Hot patterns use inline flags so they compile under both re and re2
+# Anchored alternatives, tried in order: "$12.34", then "12.34$", then a bare number
+_PRICE_ANY_RE = _re.compile(
+    r"(?s)(?:.*?[\$£€¥]\s*(?P<a>[\d,]+\.?\d*))"
+    r"|(?:.*?(?P<b>[\d,]+\.?\d*)\s*[\$£€¥])"
+    r"|(?:.*?(?P<c>[\d,]+\.?\d*))"
+)
+# The later alternatives on their own, for when the matched amount is zero
+_PRICE_LATER_RES = (
+    ("b", _re.compile(r"([\d,]+\.?\d*)\s*[\$£€¥]")),
+    ("c", _re.compile(r"([\d,]+\.?\d*)")),
+)
+_OPTIONS_RE = _re.compile(r"(?i)\d+\s+options?\s+from\s+\$\s*([\d,]+\.?\d*)")
+_RATING_RE = _re.compile(r"([\d.]+)")
+_DIGITS_COMMA_RE = _re.compile(r"([\d,]+)")
+_BSR_RE = _re.compile(r"#(\d+)\s+in\s+([^(]+)")
+
+
+# ===== Parsing Helpers =====
+def parse_amount(number_text: str) -> Optional[float]:
+    """Positive value of a "1,234.56"-style number, or None"""
+    # Most prices have no thousands separator, so skip the copy for those
+    if "," in number_text:
+        number_text = number_text.replace(",", "")
+    try:
+        value = float(number_text)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def parse_price(price_text: str) -> Tuple[Optional[float], str]:
+    """Extract price and currency from text"""
+    if not price_text:
+        return None, "$"
+
+    price_text = price_text.strip()
+    price_text = _PRICE_PREFIX_RE.sub("", price_text)
+    price_text = price_text.strip()
+
+    # Extract currency ("$" on nearly every amazon.com price)
+    if "$" in price_text:
+        currency = "$"
+    else:
+        currency_match = _CURRENCY_RE.search(price_text)
+        currency = currency_match.group(1) if currency_match else "$"
+
+    # Extract numeric value
+    price_match = _PRICE_ANY_RE.match(price_text)
+    if price_match:
+        matched = next(name for name in "abc" if price_match.group(name) is not None)
+        price_val = parse_amount(price_match.group(matched))
+        if price_val:
+            return price_val, currency
+
+        # A zero or malformed amount falls through to the later alternatives
+        for name, pattern in _PRICE_LATER_RES:
+            if name > matched:
+                later_match = pattern.search(price_text)
+                price_val = later_match and parse_amount(later_match.group(1))
+                if price_val:
+                    return price_val, currency
+
+    return None, currency
+
+
+def format_bsr(bsr_text: str) -> str:
+    """Only "#1 in Home & Kitchen", without the "See Top 100" link"""
+    match = _BSR_RE.search(bsr_text)
+    if match:
+        return f"#{match.group(1)} in {match.group(2).strip()}"
+    return bsr_text.split("(")[0].strip()
+
+
 # ===== Data Model =====
-@dataclass
+@dataclass(slots=True)
 class ProductModel:
     asin: str
     title: str
@@ -43,16 +136,56 @@ class ProductModel:
     main_image_url: Optional[str] = None
 
 
+# Parse workers start from a clean server process (or fresh interpreter
+# where forkserver is unavailable) rather than forking a threaded parent
+PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+# Column order of astuple(ProductModel)
+_COLS = tuple(field.name for field in fields(ProductModel))
+# Upsert: a re-scraped asin is updated in place, keeping its row id
+_INSERT_SQL = (
+    f"INSERT INTO products ({', '.join(_COLS)}) "
+    f"VALUES ({', '.join('?' * len(_COLS))}) "
+    f"ON CONFLICT(asin) DO UPDATE SET "
+    f"{', '.join(f'{col} = excluded.{col}' for col in _COLS if col != 'asin')}, "
+    f"scraped_at = CURRENT_TIMESTAMP"
+)
+
+
 # ===== Database Manager =====
 class DatabaseManager:
     def __init__(self, db_path="amazon_products.db"):
         self.db_path = db_path
-        self.init_database()
+        # Opened on the first save, so runs that scrape nothing don't touch the file
+        self.conn = None
+
+    def _ensure(self):
+        """Open the connection (one per run, in autocommit mode) if needed"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self.init_database()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        # WAL: commits append to the log instead of a full-sync rewrite,
+        # and the API can keep reading while the scraper writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("PRAGMA wal_autocheckpoint=1000")
+        # Keep the table and its asin index in memory for the UNIQUE checks
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        # asin needs no extra index: UNIQUE already creates one
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS products (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,43 +206,27 @@ class DatabaseManager:
             )
         """
         )
-        conn.commit()
-        conn.close()
         logger.info("Database initialized")
 
     def save_product(self, product: ProductModel):
+        self.save_products([product])
+
+    def save_products(self, products: List[ProductModel]):
+        """Save products in a single transaction"""
+        if not products:
+            return
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO products 
-                (asin, title, rank, price, currency, list_price, discount_percent,
-                 rating, reviews_count, is_prime, best_sellers_rank, bullet_points,
-                 main_image_url)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    product.asin,
-                    product.title,
-                    product.rank,
-                    product.price,
-                    product.currency,
-                    product.list_price,
-                    product.discount_percent,
-                    product.rating,
-                    product.reviews_count,
-                    product.is_prime,
-                    product.best_sellers_rank,
-                    product.bullet_points,
-                    product.main_image_url,
-                ),
+            self._ensure()
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                _INSERT_SQL, [astuple(product) for product in products]
             )
-            conn.commit()
-            conn.close()
-            logger.info(f"Saved: {product.asin}")
+            self.conn.execute("COMMIT")
+            logger.info(f"Saved: {', '.join(p.asin for p in products)}")
         except Exception as e:
-            logger.error(f"Error saving product: {e}")
+            if self.conn is not None and self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            logger.error(f"Error saving products: {e}")
 
 
 # ===== Selenium Configuration =====
@@ -120,125 +237,98 @@ class SeleniumConfig:
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     ]
 
+    # Fixed switches; only the user agent varies per run.
+    # The DOM is all that's scraped, so images, CSS and fonts are never loaded.
+    BASE_ARGS = (
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-blink-features=AutomationControlled",
+        "--disable-gpu",
+        "--blink-settings=imagesEnabled=false",
+    )
+    PREFS = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    }
+
     @staticmethod
     def get_chrome_options():
         options = Options()
         options.add_argument(f"user-agent={random.choice(SeleniumConfig.USER_AGENTS)}")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-gpu")
+        for arg in SeleniumConfig.BASE_ARGS:
+            options.add_argument(arg)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
+        options.add_experimental_option("prefs", SeleniumConfig.PREFS)
+        # Don't wait for subresources before returning from driver.get
+        options.page_load_strategy = "eager"
         return options
 
 
 # ===== Price Extractor =====
+# Any of these means the price block has rendered
+PRICE_READY_SELECTOR = "span.a-price span.a-offscreen, .a-price-whole, [data-a-price]"
+
+
 class PriceExtractor:
     """Class for extracting prices using different methods"""
 
     def __init__(self, driver, wait):
         self.driver = driver
         self.wait = wait
+        # find_elements results for the current page, keyed by CSS selector
+        self._cache = {}
+
+    def _find(self, selector: str) -> list:
+        """find_elements by CSS selector, memoized until the next get_price call"""
+        if selector not in self._cache:
+            self._cache[selector] = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        return self._cache[selector]
 
     def extract_price_value(self, price_text: str) -> Tuple[Optional[float], str]:
         """Extract price and currency from text"""
-        if not price_text:
-            return None, "$"
-
-        price_text = price_text.strip()
-        price_text = re.sub(
-            r"^(Price|From|Save|Limited time deal|List Price|List:)[\s:]*",
-            "",
-            price_text,
-            flags=re.IGNORECASE,
-        )
-        price_text = price_text.strip()
-
-        # Extract currency
-        currency_match = re.search(r"([\$£€¥])", price_text)
-        currency = currency_match.group(1) if currency_match else "$"
-
-        # Extract numeric value
-        price_patterns = [
-            r"[\$£€¥]\s*([\d,]+\.?\d*)",
-            r"([\d,]+\.?\d*)\s*[\$£€¥]",
-            r"([\d,]+\.?\d*)",
-        ]
+        return parse_price(price_text)
 
-        for pattern in price_patterns:
-            price_match = re.search(pattern, price_text)
-            if price_match:
-                price_str = price_match.group(1).replace(",", "")
-                try:
-                    price_val = float(price_str)
-                    if price_val > 0:
-                        return price_val, currency
-                except ValueError:
-                    continue
-
-        return None, currency
-
-    def try_options_text(self) -> Optional[Tuple[float, str]]:
-        """Method 1: Extract from 'X options from $XX.XX' text"""
+    def offscreen_price_text(self) -> str:
+        """Text of the first offscreen price span, or "" if there is none"""
         try:
-            text_elements = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "span.a-size-small, span.olpWrapper, #twister_swatch_price",
+            elem = self.driver.find_element(
+                By.CSS_SELECTOR, "span.a-price span.a-offscreen"
             )
+            return elem.get_attribute("textContent") or ""
+        except NoSuchElementException:
+            return ""
 
-            for elem in text_elements:
-                text = elem.text.strip()
-                match = re.search(
-                    r"\d+\s+options?\s+from\s+\$\s*([\d,]+\.?\d*)", text, re.IGNORECASE
-                )
-                if match:
-                    price_str = match.group(1).replace(",", "")
-                    price_val = float(price_str)
-                    if price_val > 0:
-                        logger.info(f"Price (from options text): ${price_val}")
-                        return price_val, "$"
-        except Exception as e:
-            logger.debug(f"Options text method failed: {e}")
-        return None
-
-    def try_select_variant(self) -> Optional[Tuple[float, str]]:
-        """Method 2: Select first variant and extract price"""
+    def try_data_attributes(self) -> Optional[Tuple[float, str]]:
+        """Method 1: Data attributes"""
         try:
-            variants = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "#variation_color_name li.swatchSelect, #variation_size_name li.swatchSelect, "
-                "ul.swatches li.swatchAvailable",
+            data = self.driver.execute_script(
+                """
+                let elems = document.querySelectorAll('[data-a-price]');
+                for(let elem of elems) {
+                    try {
+                        let data = JSON.parse(elem.getAttribute('data-a-price'));
+                        if(data && data.amount) return data.symbol + data.amount;
+                    } catch(e) {}
+                }
+                return null;
+            """
             )
 
-            if variants:
-                self.driver.execute_script("arguments[0].click();", variants[0])
-                logger.info("Selected first variant")
-                time.sleep(2)
-
-                offscreen = self.driver.find_elements(
-                    By.CSS_SELECTOR, "span.a-price span.a-offscreen"
-                )
-                for elem in offscreen[:3]:
-                    price_text = elem.get_attribute("textContent") or elem.text
-                    if price_text and "$" in price_text:
-                        price, currency = self.extract_price_value(price_text)
-                        if price and price > 0:
-                            logger.info(
-                                f"Price (after variant selection): {currency}{price}"
-                            )
-                            return price, currency
+            if data:
+                price, currency = self.extract_price_value(data)
+                if price and price > 0:
+                    logger.info(f"Price (data attr): {currency}{price}")
+                    return price, currency
         except Exception as e:
-            logger.debug(f"Variant selection failed: {e}")
+            logger.debug(f"Data attribute method failed: {e}")
         return None
 
     def try_offscreen_elements(self) -> Optional[Tuple[float, str]]:
-        """Method 3: All offscreen elements"""
+        """Method 2: All offscreen elements"""
         try:
-            elements = self.driver.find_elements(
-                By.CSS_SELECTOR, "span.a-price span.a-offscreen"
-            )
-            for elem in elements[:5]:
+            for elem in self._find("span.a-price span.a-offscreen")[:5]:
                 price_text = elem.get_attribute("textContent") or elem.text
                 if price_text and "$" in price_text:
                     price, currency = self.extract_price_value(price_text)
@@ -250,7 +340,7 @@ class PriceExtractor:
         return None
 
     def try_visible_price(self) -> Optional[Tuple[float, str]]:
-        """Method 4: Visible price (whole + fraction)"""
+        """Method 3: Visible price (whole + fraction)"""
         try:
             selectors = [
                 ".a-price-whole",
@@ -260,7 +350,10 @@ class PriceExtractor:
 
             for selector in selectors:
                 try:
-                    whole = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    elements = self._find(selector)
+                    if not elements:
+                        continue
+                    whole = elements[0]
                     whole_text = whole.text.strip().replace(",", "")
 
                     fraction = "00"
@@ -287,7 +380,7 @@ class PriceExtractor:
         return None
 
     def try_javascript_search(self) -> Optional[Tuple[float, str]]:
-        """Method 5: JavaScript search throughout the page"""
+        """Method 4: JavaScript search throughout the page"""
         try:
             js_result = self.driver.execute_script(
                 """
@@ -315,65 +408,97 @@ class PriceExtractor:
             logger.debug(f"JS search failed: {e}")
         return None
 
-    def try_data_attributes(self) -> Optional[Tuple[float, str]]:
-        """Method 6: Data attributes"""
+    def try_options_text(self) -> Optional[Tuple[float, str]]:
+        """Method 5: Extract from 'X options from $XX.XX' text"""
         try:
-            data = self.driver.execute_script(
-                """
-                let elems = document.querySelectorAll('[data-a-price]');
-                for(let elem of elems) {
-                    try {
-                        let data = JSON.parse(elem.getAttribute('data-a-price'));
-                        if(data && data.amount) return data.symbol + data.amount;
-                    } catch(e) {}
-                }
-                return null;
-            """
+            text_elements = self._find(
+                "span.a-size-small, span.olpWrapper, #twister_swatch_price"
             )
 
-            if data:
-                price, currency = self.extract_price_value(data)
-                if price and price > 0:
-                    logger.info(f"Price (data attr): {currency}{price}")
-                    return price, currency
+            for elem in text_elements:
+                text = elem.text.strip()
+                match = _OPTIONS_RE.search(text)
+                if match:
+                    price_val = parse_amount(match.group(1))
+                    if price_val:
+                        logger.info(f"Price (from options text): ${price_val}")
+                        return price_val, "$"
         except Exception as e:
-            logger.debug(f"Data attribute method failed: {e}")
+            logger.debug(f"Options text method failed: {e}")
         return None
 
-    def get_price(self) -> Tuple[float, str]:
-        """Main method - tries all approaches sequentially"""
+    def try_select_variant(self) -> Optional[Tuple[float, str]]:
+        """Method 6: Select first variant and extract price"""
+        try:
+            variants = self._find(
+                "#variation_color_name li.swatchSelect, #variation_size_name li.swatchSelect, "
+                "ul.swatches li.swatchAvailable"
+            )
+
+            if variants:
+                previous = self.offscreen_price_text()
+                self.driver.execute_script("arguments[0].click();", variants[0])
+                logger.info("Selected first variant")
+
+                # Wait for the price to change instead of a fixed pause
+                try:
+                    WebDriverWait(self.driver, 5).until(
+                        lambda d: self.offscreen_price_text() != previous
+                    )
+                except TimeoutException:
+                    pass
+
+                # The click re-rendered the price block
+                self._cache.clear()
+                offscreen = self._find("span.a-price span.a-offscreen")
+                for elem in offscreen[:3]:
+                    price_text = elem.get_attribute("textContent") or elem.text
+                    if price_text and "$" in price_text:
+                        price, currency = self.extract_price_value(price_text)
+                        if price and price > 0:
+                            logger.info(
+                                f"Price (after variant selection): {currency}{price}"
+                            )
+                            return price, currency
+        except Exception as e:
+            logger.debug(f"Variant selection failed: {e}")
+        return None
+
+    def wait_for_page(self):
+        """Wait until the title and the price block have rendered"""
+        self._cache = {}
+
         # Wait for page to load
         try:
             self.wait.until(EC.presence_of_element_located((By.ID, "productTitle")))
-            time.sleep(2)
         except:
             pass
 
         # Scroll to activate lazy load
         self.driver.execute_script("window.scrollBy(0, 300);")
-        time.sleep(1)
-
-        # Check for unavailable status
         try:
-            unavailable = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "#availability span.a-color-price, #availability span.a-color-state",
+            WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, PRICE_READY_SELECTOR))
             )
-            for elem in unavailable:
-                if "unavailable" in elem.text.lower():
-                    logger.warning("Product unavailable")
-                    return 0.0, "$"
-        except:
+        except TimeoutException:
             pass
 
+    def get_price(self, availability: str = "") -> Tuple[float, str]:
+        """Main method - tries all approaches sequentially"""
+        # Check for unavailable status (lowercased #availability text)
+        if "unavailable" in availability:
+            logger.warning("Product unavailable")
+            return 0.0, "$"
+
         # Try all methods
+        # Cheap read-only lookups first; clicking a variant is the last resort
         methods = [
-            self.try_options_text,
-            self.try_select_variant,
+            self.try_data_attributes,
             self.try_offscreen_elements,
             self.try_visible_price,
             self.try_javascript_search,
-            self.try_data_attributes,
+            self.try_options_text,
+            self.try_select_variant,
         ]
 
         for method in methods:
@@ -385,13 +510,215 @@ class PriceExtractor:
         return 0.0, "$"
 
 
+# ===== HTTP Extractor =====
+_PAGE_PRICE_SELECTORS = [
+    ".a-priceToPay span.a-offscreen",
+    "#corePrice_feature_div span.a-offscreen",
+    "span.a-price span.a-offscreen",
+]
+
+
+class FastExtractor:
+    """Downloads server-rendered product pages, without a browser"""
+
+    def __init__(self):
+        self.headers = {
+            "User-Agent": random.choice(SeleniumConfig.USER_AGENTS),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's session; each keeps its connections alive, and a
+        requests.Session is not safe to share between fetch threads"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def get_page(self, asin: str) -> Optional[bytes]:
+        """Raw product page, or None when it can't be used without a browser"""
+        url = f"https://www.amazon.com/dp/{asin}"
+        try:
+            response = self.session.get(url, timeout=15)
+        except requests.RequestException as e:
+            logger.debug(f"HTTP fetch failed for {asin}: {e}")
+            return None
+
+        if response.status_code != 200 or b"validateCaptcha" in response.content:
+            logger.info(f"HTTP fetch blocked for {asin} ({response.status_code})")
+            return None
+
+        return response.content
+
+
+# Module-level so it can be sent to the parse worker processes
+def parse_product_page(html: bytes) -> Optional[dict]:
+    """Product details from a page, or None if it lacks them"""
+    soup = BeautifulSoup(html, "lxml")
+    details = {}
+
+    def text_of(selector):
+        elem = soup.select_one(selector)
+        return elem.get_text(strip=True) if elem else ""
+
+    # Title
+    title = text_of("#productTitle")
+    if not title:
+        return None
+    details["title"] = title
+
+    # Price
+    availability = text_of("#availability").lower()
+    price, currency = None, "$"
+    for selector in _PAGE_PRICE_SELECTORS:
+        price, currency = parse_price(text_of(selector))
+        if price:
+            break
+    if not price:
+        if "unavailable" not in availability:
+            return None
+        price, currency = 0.0, "$"
+    details["price"] = price
+    details["currency"] = currency
+
+    # List price (discount)
+    list_price, _ = parse_price(text_of("span.a-price.a-text-price span.a-offscreen"))
+    if list_price and list_price > 0 and price > 0:
+        details["list_price"] = list_price
+        discount = ((list_price - price) / list_price) * 100
+        details["discount_percent"] = round(discount, 2)
+
+    # Rating
+    match = _RATING_RE.search(text_of("i.a-icon-star span.a-icon-alt"))
+    if match:
+        try:
+            details["rating"] = float(match.group(1))
+        except ValueError:
+            pass
+
+    # Reviews
+    match = _DIGITS_COMMA_RE.search(text_of("span#acrCustomerReviewText"))
+    if match:
+        details["reviews_count"] = int(match.group(1).replace(",", ""))
+
+    # Bullet points
+    bullets = []
+    for elem in soup.select("#feature-bullets ul li span.a-list-item")[:5]:
+        text = elem.get_text(strip=True)
+        if text and len(text) > 10:
+            bullets.append(text)
+    if bullets:
+        details["bullet_points"] = " | ".join(bullets)
+
+    # Best Sellers Rank
+    bsr_text = ""
+    for th_elem in soup.select("th.prodDetSectionEntry"):
+        if "Best Sellers Rank" in th_elem.get_text():
+            td_elem = th_elem.find_next_sibling("td")
+            first_item = td_elem and (td_elem.select_one("ul li") or td_elem)
+            bsr_text = first_item.get_text(" ", strip=True) if first_item else ""
+            break
+    if not bsr_text:
+        for span in soup.select("#productDetails_detailBullets_sections1 span"):
+            span_text = span.get_text(" ", strip=True)
+            if span_text.startswith("#") and "in" in span_text:
+                bsr_text = span_text
+                break
+    if not bsr_text:
+        # Detail-bullets layout: "Best Sellers Rank: #1 in ..." as a list item
+        for item in soup.select("#detailBullets_feature_div li"):
+            item_text = item.get_text(" ", strip=True)
+            if "Best Sellers Rank" in item_text:
+                bsr_text = item_text
+                break
+    if bsr_text:
+        details["best_sellers_rank"] = format_bsr(bsr_text)
+
+    # Image
+    img = soup.select_one("#landingImage")
+    if img and img.get("src"):
+        details["main_image_url"] = img["src"]
+
+    # Prime
+    details["is_prime"] = soup.select_one("i.a-icon-prime") is not None
+
+    logger.info(f"Title: {title[:60]}... Price: {currency}{price} (HTTP)")
+    return details
+
+
 # ===== Amazon Scraper =====
 class AmazonScraper:
+    # Concurrent product page fetches, kept low to stay under Amazon's rate limit
+    MAX_FETCH_WORKERS = 5
+
+    # Reads all non-price fields from the rendered page in one WebDriver call
+    DETAILS_JS = """
+        const text = (selector) => {
+            const elem = document.querySelector(selector);
+            return elem ? elem.textContent.trim() : "";
+        };
+
+        let bsrText = "";
+        for (const th of document.querySelectorAll("th.prodDetSectionEntry")) {
+            if (th.innerText.includes("Best Sellers Rank")) {
+                const span = th.parentElement.querySelector(
+                    "td ul li:first-child span"
+                );
+                bsrText = span ? span.innerText.trim() : "";
+                break;
+            }
+        }
+        if (!bsrText) {
+            const spans = document.querySelectorAll(
+                "#productDetails_detailBullets_sections1 span"
+            );
+            for (const span of spans) {
+                const spanText = span.innerText.trim();
+                if (spanText.startsWith("#") && spanText.includes("in")) {
+                    bsrText = spanText;
+                    break;
+                }
+            }
+        }
+        if (!bsrText) {
+            const items = document.querySelectorAll("#detailBullets_feature_div li");
+            for (const item of items) {
+                const itemText = item.innerText.trim();
+                if (itemText.includes("Best Sellers Rank")) {
+                    bsrText = itemText;
+                    break;
+                }
+            }
+        }
+
+        const bullets = document.querySelectorAll(
+            "#feature-bullets ul li span.a-list-item"
+        );
+        const image = document.getElementById("landingImage");
+
+        return {
+            title: text("#productTitle"),
+            availability: text("#availability").toLowerCase(),
+            listPriceText: text("span.a-price.a-text-price span.a-offscreen"),
+            ratingText: text("i.a-icon-star span.a-icon-alt"),
+            reviewsText: text("span#acrCustomerReviewText"),
+            bullets: Array.from(bullets, (elem) => elem.innerText.trim()).slice(0, 5),
+            bsrText: bsrText,
+            imageSrc: image ? image.src : null,
+            isPrime: document.querySelector("i.a-icon-prime") !== null,
+        };
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.driver = None
         self.wait = None
         self.price_extractor = None
+        self.fast_extractor = FastExtractor()
 
     def init_driver(self):
         try:
@@ -409,176 +736,98 @@ class AmazonScraper:
             self.driver.quit()
             logger.info("Driver closed")
 
-    def extract_rating(self) -> Optional[float]:
-        """Extract rating"""
-        try:
-            elem = self.driver.find_element(
-                By.CSS_SELECTOR, "i.a-icon-star span.a-icon-alt"
-            )
-            text = elem.get_attribute("textContent") or elem.text
-            match = re.search(r"([\d.]+)", text)
-            if match:
-                return float(match.group(1))
-        except:
-            pass
-        return None
-
-    def extract_reviews_count(self) -> Optional[int]:
-        """Extract number of reviews"""
+    def fetch_product_page(self, asin: str) -> Optional[bytes]:
+        """Get the product page over plain HTTP (runs in the fetch pool)"""
+        # Jitter, so the pooled requests don't hit Amazon at the same instant
+        time.sleep(random.uniform(0.5, 2))
+        logger.info(f"Fetching details for ASIN: {asin}")
         try:
-            elem = self.driver.find_element(
-                By.CSS_SELECTOR, "span#acrCustomerReviewText"
-            )
-            text = elem.text.strip()
-            match = re.search(r"([\d,]+)", text)
-            if match:
-                return int(match.group(1).replace(",", ""))
-        except:
-            pass
-        return None
-
-    def extract_bullet_points(self) -> str:
-        """Extract bullet points"""
-        try:
-            bullets = []
-            elements = self.driver.find_elements(
-                By.CSS_SELECTOR, "#feature-bullets ul li span.a-list-item"
-            )
-            for elem in elements[:5]:
-                text = elem.text.strip()
-                if text and len(text) > 10:
-                    bullets.append(text)
-            return " | ".join(bullets) if bullets else ""
-        except:
-            return ""
+            return self.fast_extractor.get_page(asin)
+        except Exception as e:
+            logger.error(f"HTTP fetch failed for {asin}: {e}")
+            return None
 
-    def extract_best_sellers_rank(self) -> Optional[str]:
-        """Extract Best Sellers Rank (first rank)"""
+    @staticmethod
+    def parsed_details(job: Optional[Future]) -> Optional[dict]:
+        """Result of a parse_product_page job, or None if there is none"""
+        if job is None:
+            return None
         try:
-            # Look for BSR table
-            bsr_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, "th.prodDetSectionEntry"
-            )
-
-            for th_elem in bsr_elements:
-                if "Best Sellers Rank" in th_elem.text:
-                    # Found header, look for data in next td
-                    parent_row = th_elem.find_element(By.XPATH, "..")
-                    td_elem = parent_row.find_element(By.TAG_NAME, "td")
-
-                    # Extract first rank (e.g., "#1 in Home & Kitchen")
-                    first_item = td_elem.find_element(
-                        By.CSS_SELECTOR, "ul li:first-child span"
-                    )
-                    rank_text = first_item.text.strip()
-
-                    # Extract only "#1 in Home & Kitchen" without "See Top 100" link
-                    rank_match = re.search(r"#(\d+)\s+in\s+([^(]+)", rank_text)
-                    if rank_match:
-                        rank_number = rank_match.group(1)
-                        category = rank_match.group(2).strip()
-                        result = f"#{rank_number} in {category}"
-                        logger.info(f"BSR: {result}")
-                        return result
-
-                    # If regex didn't work, return as is
-                    return rank_text.split("(")[0].strip()
-
-            # Alternative method via ID
-            try:
-                bsr_elem = self.driver.find_element(
-                    By.ID, "productDetails_detailBullets_sections1"
-                )
-                spans = bsr_elem.find_elements(By.CSS_SELECTOR, "span")
-                for span in spans:
-                    text = span.text.strip()
-                    if text.startswith("#") and "in" in text:
-                        return text.split("(")[0].strip()
-            except:
-                pass
-
+            return job.result()
         except Exception as e:
-            logger.debug(f"BSR extraction failed: {e}")
-
-        return None
+            logger.error(f"HTTP extraction failed: {e}")
+            return None
 
-    def get_product_details(self, asin: str) -> dict:
-        """Get detailed product data"""
+    def get_product_details_browser(self, asin: str) -> dict:
+        """Get detailed product data by rendering the page in Chrome"""
         url = f"https://www.amazon.com/dp/{asin}"
         details = {}
 
         try:
-            logger.info(f"Fetching details for ASIN: {asin}")
             self.driver.get(url)
+            self.price_extractor.wait_for_page()
+
+            # Everything but the price in a single round-trip
+            data = self.driver.execute_script(self.DETAILS_JS)
+
+            # Price
+            price, currency = self.price_extractor.get_price(data["availability"])
 
             # Title
-            try:
-                title_elem = self.driver.find_element(By.ID, "productTitle")
-                details["title"] = title_elem.text.strip()
+            if data["title"]:
+                details["title"] = data["title"]
                 logger.info(f"Title: {details['title'][:60]}...")
-            except:
+            else:
                 details["title"] = f"Product {asin}"
                 logger.warning("Title not found")
 
-            # Price
-            price, currency = self.price_extractor.get_price()
             details["price"] = price
             details["currency"] = currency
 
             # List price (discount)
-            try:
-                elem = self.driver.find_element(
-                    By.CSS_SELECTOR, "span.a-price.a-text-price span.a-offscreen"
-                )
-                list_price, _ = self.price_extractor.extract_price_value(
-                    elem.text.strip()
-                )
-                if list_price and list_price > 0 and price > 0:
-                    details["list_price"] = list_price
-                    discount = ((list_price - price) / list_price) * 100
-                    details["discount_percent"] = round(discount, 2)
-                    logger.info(f"Discount: {details['discount_percent']}%")
-            except:
-                pass
+            list_price, _ = parse_price(data["listPriceText"])
+            if list_price and list_price > 0 and price > 0:
+                details["list_price"] = list_price
+                discount = ((list_price - price) / list_price) * 100
+                details["discount_percent"] = round(discount, 2)
+                logger.info(f"Discount: {details['discount_percent']}%")
 
             # Rating
-            rating = self.extract_rating()
-            if rating:
-                details["rating"] = rating
-                logger.info(f"Rating: {rating}")
+            match = _RATING_RE.search(data["ratingText"])
+            if match:
+                try:
+                    details["rating"] = float(match.group(1))
+                    logger.info(f"Rating: {details['rating']}")
+                except ValueError:
+                    pass
 
             # Reviews
-            reviews = self.extract_reviews_count()
-            if reviews:
-                details["reviews_count"] = reviews
-                logger.info(f"Reviews: {reviews}")
+            match = _DIGITS_COMMA_RE.search(data["reviewsText"])
+            if match:
+                details["reviews_count"] = int(match.group(1).replace(",", ""))
+                logger.info(f"Reviews: {details['reviews_count']}")
 
             # Bullet points
-            bullets = self.extract_bullet_points()
+            bullets = [text for text in data["bullets"] if len(text) > 10]
             if bullets:
-                details["bullet_points"] = bullets
-                logger.info(f"Bullets: {len(bullets.split('|'))} items")
+                details["bullet_points"] = " | ".join(bullets)
+                logger.info(f"Bullets: {len(bullets)} items")
 
             # Best Sellers Rank
-            bsr = self.extract_best_sellers_rank()
-            if bsr:
-                details["best_sellers_rank"] = bsr
+            bsr_text = data["bsrText"]
+            if bsr_text:
+                details["best_sellers_rank"] = format_bsr(bsr_text)
+                logger.info(f"BSR: {details['best_sellers_rank']}")
 
             # Image
-            try:
-                img = self.driver.find_element(By.ID, "landingImage")
-                details["main_image_url"] = img.get_attribute("src")
+            if data["imageSrc"]:
+                details["main_image_url"] = data["imageSrc"]
                 logger.info("Image found")
-            except:
-                pass
 
             # Prime
-            try:
-                self.driver.find_element(By.CSS_SELECTOR, "i.a-icon-prime")
-                details["is_prime"] = True
+            details["is_prime"] = data["isPrime"]
+            if details["is_prime"]:
                 logger.info("Prime: Yes")
-            except:
-                details["is_prime"] = False
 
             return details
 
@@ -586,6 +835,59 @@ class AmazonScraper:
             logger.error(f"Error getting details for {asin}: {e}")
             return details
 
+    def collect_asins_from_recs_list(self, max_products: int) -> List[str]:
+        """Ranked ASINs from the grid's inline data-client-recs-list JSON"""
+        raw = self.driver.execute_script(
+            "const elem = document.querySelector('[data-client-recs-list]');"
+            "return elem ? elem.getAttribute('data-client-recs-list') : null;"
+        )
+        if not raw:
+            return []
+
+        try:
+            recs = json.loads(raw)
+        except ValueError as e:
+            logger.debug(f"Bad data-client-recs-list JSON: {e}")
+            return []
+        if not isinstance(recs, list):
+            logger.debug("data-client-recs-list is not a list")
+            return []
+
+        asins = []
+        for rec in recs:
+            asin = rec.get("id") if isinstance(rec, dict) else None
+            if asin and asin not in asins:
+                asins.append(asin)
+                if len(asins) >= max_products:
+                    break
+
+        logger.info(f"Found {len(recs)} products in page data")
+        return asins
+
+    def collect_asins_from_grid(self, max_products: int) -> List[str]:
+        """ASINs of the rendered product cards, after scrolling to load them"""
+        # Scroll the page
+        for i in range(3):
+            self.driver.execute_script("window.scrollBy(0, 500);")
+            time.sleep(random.uniform(0.3, 0.8))
+
+        elements = self.driver.find_elements(
+            By.CSS_SELECTOR, 'div[data-asin]:not([data-asin=""])'
+        )
+        logger.info(f"Found {len(elements)} products on page")
+
+        asins = []
+        for elem in elements[: max_products * 2]:
+            try:
+                asin = elem.get_attribute("data-asin")
+                if asin and asin.strip() and asin not in asins:
+                    asins.append(asin)
+                    if len(asins) >= max_products:
+                        break
+            except:
+                continue
+        return asins
+
     def scrape_top_products(
         self, category_url: str, max_products: int = 5
     ) -> List[ProductModel]:
@@ -598,40 +900,40 @@ class AmazonScraper:
             self.wait.until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[data-asin]"))
             )
-            time.sleep(random.uniform(3, 5))
-
-            # Scroll the page
-            for i in range(3):
-                self.driver.execute_script("window.scrollBy(0, 500);")
-                time.sleep(random.uniform(1, 2))
-
-            # Collect ASINs
-            elements = self.driver.find_elements(
-                By.CSS_SELECTOR, 'div[data-asin]:not([data-asin=""])'
-            )
-            logger.info(f"Found {len(elements)} products on page")
 
-            asins = []
-            for elem in elements[: max_products * 2]:
-                try:
-                    asin = elem.get_attribute("data-asin")
-                    if asin and asin.strip() and asin not in asins:
-                        asins.append(asin)
-                        if len(asins) >= max_products:
-                            break
-                except:
-                    continue
+            # Collect ASINs, scrolling the grid only if the page data lacks them
+            asins = self.collect_asins_from_recs_list(max_products)
+            if not asins:
+                asins = self.collect_asins_from_grid(max_products)
 
             logger.info(f"Collected {len(asins)} ASINs to process")
 
+            # Fetch product pages concurrently, parsing each one in a worker
+            # process as soon as it arrives. Workers start lazily while the
+            # fetch threads run, so they must not be forked from this process.
+            parse_workers = max(1, min(len(asins), os.cpu_count() or 1))
+            with ProcessPoolExecutor(
+                max_workers=parse_workers, mp_context=PARSE_MP_CONTEXT
+            ) as parse_pool:
+                with ThreadPoolExecutor(max_workers=self.MAX_FETCH_WORKERS) as pool:
+                    jobs = [
+                        parse_pool.submit(parse_product_page, page) if page else None
+                        for page in pool.map(self.fetch_product_page, asins)
+                    ]
+                fetched = [self.parsed_details(job) for job in jobs]
+
             # Process products
-            for rank, asin in enumerate(asins, 1):
+            for rank, (asin, details) in enumerate(zip(asins, fetched), 1):
                 try:
                     logger.info(f"\n{'='*60}")
                     logger.info(f"Processing product #{rank}/{len(asins)}")
                     logger.info(f"{'='*60}")
 
-                    details = self.get_product_details(asin)
+                    if details is None:
+                        # The driver isn't thread-safe, so fallbacks run one at a time
+                        logger.info(f"Falling back to the browser for {asin}")
+                        details = self.get_product_details_browser(asin)
+                        time.sleep(random.uniform(0.3, 0.8))
 
                     if not details or "title" not in details:
                         logger.warning(f"Skipping {asin}")
@@ -653,16 +955,12 @@ class AmazonScraper:
                         main_image_url=details.get("main_image_url"),
                     )
 
-                    self.db_manager.save_product(product)
                     products.append(product)
 
                     logger.info(
                         f"Product #{rank} completed: {product.currency}{product.price}"
                     )
 
-                    # Delay
-                    time.sleep(random.uniform(3, 5))
-
                 except Exception as e:
                     logger.error(f"Error processing #{rank} (ASIN: {asin}): {e}")
                     continue
@@ -677,6 +975,10 @@ class AmazonScraper:
             logger.error(f"Scraping failed: {e}")
             return products
 
+        finally:
+            # One transaction for the whole run, including partial results
+            self.db_manager.save_products(products)
+
 
 # ===== Main Execution =====
 def main():
@@ -725,6 +1027,7 @@ def main():
         logger.error(f"Fatal error: {e}")
     finally:
         scraper.close_driver()
+        db_manager.close()
         logger.info("\nScraper finished")
 
 
@@ -1,5 +1,7 @@
 // API Configuration - automatically uses current server URL
 const API_BASE_URL = window.location.origin;
+// Largest page /api/products serves, so the dashboard needs few requests
+const PAGE_SIZE = 1000;
 let productsData = [];
 
 console.log('🚀 Dashboard starting...');
@@ -41,23 +43,38 @@ async function loadStats() {
 async function loadProducts() {
     try {
         console.log('📦 Fetching products...');
-        const response = await fetch(`${API_BASE_URL}/api/products`);
+        const products = [];
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        let more = true;
         
-        console.log('Response status:', response.status);
-        
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        // Follow the next_after cursor until the last page
+        while (more) {
+            const response = await fetch(`${API_BASE_URL}/api/products?${params}`);
+            
+            console.log('Response status:', response.status);
+            
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            
+            const data = await response.json();
+            
+            if (!data.success) {
+                showError('Failed to load products: ' + data.error);
+                return;
+            }
+            
+            products.push(...data.products);
+            more = data.next_after !== null;
+            if (more) {
+                params.set('after_rank', data.next_after.rank);
+                params.set('after_id', data.next_after.id);
+            }
         }
         
-        const data = await response.json();
-        console.log('✅ Products loaded:', data);
-        
-        if (data.success) {
-            productsData = data.products;
-            displayProducts(productsData);
-        } else {
-            showError('Failed to load products: ' + data.error);
-        }
+        console.log('✅ Products loaded:', products.length);
+        productsData = products;
+        displayProducts(productsData);
     } catch (error) {
         console.error('❌ Error loading products:', error);
         showError('Error connecting to API: ' + error.message);
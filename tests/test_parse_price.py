@@ -0,0 +1,29 @@
+"""
+parse_price must return what the original per-pattern loop returned,
+including when the first matching pattern finds a zero amount
+"""
+
+import pytest
+
+from scraper import parse_price
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("£0 or 4.5£", (4.5, "£")),
+        ("£, 3€", (3.0, "£")),
+        ("£0.00", (None, "£")),
+        ("$0 - 0 $ - 7", (None, "$")),
+        ("12,99€", (1299.0, "€")),
+        ("1 x 25 €", (25.0, "€")),
+        ("19.99", (19.99, "$")),
+        ("0", (None, "$")),
+        ("3 options from $5.00", (5.0, "$")),
+        ("Price: $24.99", (24.99, "$")),
+        ("From: ¥1,200", (1200.0, "¥")),
+        ("", (None, "$")),
+    ],
+)
+def test_parse_price_matches_baseline(text, expected):
+    assert parse_price(text) == expected
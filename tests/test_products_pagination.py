@@ -0,0 +1,49 @@
+"""
+Keyset pagination over /api/products must reach every row, including
+products the scraper stored without a rank
+"""
+
+import api_server
+from scraper import DatabaseManager, ProductModel
+
+
+def test_pages_through_null_ranks(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "products.db")
+    db = DatabaseManager(db_path)
+    db.save_products(
+        [
+            ProductModel("B000000001", "Unranked", None, 10.0),
+            ProductModel("B000000002", "Second", 2, 20.0),
+            ProductModel("B000000003", "Zero", 0, 30.0),
+            ProductModel("B000000004", "First", 1, 40.0),
+            ProductModel("B000000005", "Also unranked", None, 50.0),
+        ]
+    )
+    db.close()
+
+    monkeypatch.setattr(api_server, "DB_PATH", db_path)
+    monkeypatch.setattr(api_server, "_local", api_server.threading.local())
+    monkeypatch.setattr(api_server, "_schema_ready", False)
+    api_server._CACHE.clear()
+    client = api_server.app.test_client()
+
+    asins = []
+    params = {"limit": 2}
+    while True:
+        body = client.get("/api/products", query_string=params).get_json()
+        asins += [product["asin"] for product in body["products"]]
+        if body["next_after"] is None:
+            break
+        params = {
+            "limit": 2,
+            "after_rank": body["next_after"]["rank"],
+            "after_id": body["next_after"]["id"],
+        }
+
+    assert asins == [
+        "B000000003",
+        "B000000004",
+        "B000000002",
+        "B000000001",
+        "B000000005",
+    ]
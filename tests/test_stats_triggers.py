@@ -0,0 +1,47 @@
+"""
+The scraper's upsert must keep working once the API has installed its
+products_stats triggers
+"""
+
+import api_server
+from scraper import DatabaseManager, ProductModel
+
+
+def test_upsert_existing_asin_with_stats_triggers(tmp_path):
+    db = DatabaseManager(str(tmp_path / "products.db"))
+    db.save_products([ProductModel("B000000001", "First", 1, 10.0)])
+    # What the API does on its first connection
+    api_server.init_database(db.conn)
+
+    db.save_products(
+        [
+            ProductModel("B000000001", "Re-scraped", 1, 20.0, is_prime=True),
+            ProductModel("B000000002", "Second", 2, 40.0),
+        ]
+    )
+
+    rows = db.conn.execute("SELECT asin, title FROM products ORDER BY rank").fetchall()
+    assert rows == [("B000000001", "Re-scraped"), ("B000000002", "Second")]
+    total, avg_price, avg_rating, prime_count = db.conn.execute(
+        api_server.SQL_STATS
+    ).fetchone()
+    assert (total, avg_price, prime_count) == (2, 30.0, 1)
+
+
+def test_stats_deltas_match_full_recompute(tmp_path):
+    db = DatabaseManager(str(tmp_path / "products.db"))
+    db.save_products([ProductModel("B000000001", "First", 1, 10.0, rating=4.0)])
+    api_server.init_database(db.conn)
+    # A second process starting up must not rebuild or double-count
+    api_server.init_database(db.conn)
+
+    db.save_products(
+        [
+            ProductModel("B000000002", "Second", 2, None, rating=5.0, is_prime=True),
+            ProductModel("B000000003", "Third", 3, 30.0),
+        ]
+    )
+    db.conn.execute("DELETE FROM products WHERE asin = 'B000000001'")
+
+    stats = db.conn.execute(api_server.SQL_STATS).fetchone()
+    assert stats == (2, 30.0, 5.0, 1)